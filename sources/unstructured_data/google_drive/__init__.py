@@ -1,7 +1,10 @@
 """This resource downloads files and collects filepaths from Google Drive folder to destinations"""
+import os
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
+from functools import partial
 from pathlib import Path
-from typing import Any, Sequence, Union
+from typing import Any, Callable, Optional, Sequence, Union
 
 import dlt
 from dlt.common import logger
@@ -9,7 +12,11 @@ from dlt.extract.source import TDataItem, TDataItems
 from dlt.sources.credentials import GcpOAuthCredentials, GcpServiceAccountCredentials
 from googleapiclient.discovery import build  # type: ignore
 
-from .helpers import download_file_from_google_drive
+from .helpers import (
+    build_authorized_http,
+    download_file_from_google_drive,
+    to_timestamp_ns,
+)
 from .settings import FOLDER_IDS, STORAGE_FOLDER_PATH
 
 SCOPE = "https://www.googleapis.com/auth/drive.readonly"
@@ -48,38 +55,90 @@ def google_drive_source(
     if isinstance(credentials, GcpOAuthCredentials):
         credentials.auth(SCOPE)
 
-    service = build("drive", "v3", credentials=credentials.to_native_credentials())
+    native_credentials = credentials.to_native_credentials()
+    service = build("drive", "v3", credentials=native_credentials)
 
     if download:
         storage_folder_path_ = Path(storage_folder_path)
         storage_folder_path_.mkdir(exist_ok=True, parents=True)
 
-        yield get_files_uris(service, folder_ids) | download_files(
-            service, storage_folder_path_, filter_by_mime_type
+        yield get_files_uris(
+            service,
+            folder_ids,
+            filter_by_mime_type=filter_by_mime_type,
+            credentials=native_credentials,
+        ) | download_files(
+            service,
+            storage_folder_path_,
+            filter_by_mime_type,
+            credentials=native_credentials,
         )
     else:
-        yield get_files_uris(service, folder_ids)
+        yield get_files_uris(service, folder_ids, credentials=native_credentials)
 
 
 @dlt.resource(name="files_ids")
-def get_files_uris(service: Any, folder_ids: Sequence[str]) -> TDataItems:
+def get_files_uris(
+    service: Any,
+    folder_ids: Sequence[str],
+    filter_by_mime_type: Sequence[str] = (),
+    credentials: Any = None,
+) -> TDataItems:
     # Query the Google Drive API to get the files with the specified folder ID and extension
-    for folder_id in folder_ids:
-        results = (
+    # filter by mime type on the server, so not matching files are not listed at all
+    mime_type_query = ""
+    if filter_by_mime_type:
+        mime_type_query = " and ({})".format(
+            " or ".join(
+                f"mimeType = '{mime_type}'" for mime_type in filter_by_mime_type
+            )
+        )
+
+    def _list_page(
+        folder_id: str, page_token: Optional[str], http: Any = None
+    ) -> TDataItem:
+        return (
             service.files()
             .list(
-                q=f"'{folder_id}' in parents",
+                q=f"'{folder_id}' in parents{mime_type_query}",
                 fields="nextPageToken, files",
+                pageToken=page_token,
             )
-            .execute()
+            .execute(http=http)
         )
 
-        items = results.get("files", [])
+    # with credentials a single worker owns the listing requests on its own connection, so
+    # the next page is fetched while the current one is processed downstream. the connection
+    # of the shared service is not thread safe, so without credentials pages are listed one by one
+    http = build_authorized_http(credentials) if credentials is not None else None
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+
+        def _request_page(
+            folder_id: str, page_token: Optional[str]
+        ) -> Callable[[], TDataItem]:
+            if http is None:
+                return partial(_list_page, folder_id, page_token)
+            return executor.submit(_list_page, folder_id, page_token, http).result
+
+        for folder_id in folder_ids:
+            found_files = False
+            # yield every page as soon as it arrives instead of collecting the whole folder listing
+            next_page: Optional[Callable[[], TDataItem]] = _request_page(
+                folder_id, None
+            )
+            while next_page is not None:
+                results = next_page()
+                page_token = results.get("nextPageToken")
+                next_page = _request_page(folder_id, page_token) if page_token else None
+
+                items = results.get("files", [])
+                if items:
+                    found_files = True
+                    yield [convert_response_to_standard(item) for item in items]
 
-        if not items:
-            logger.warning(f"No files found in directory {folder_id}!")
-        else:
-            yield [convert_response_to_standard(item) for item in items]
+            if not found_files:
+                logger.warning(f"No files found in directory {folder_id}!")
 
 
 def convert_response_to_standard(response: TDataItem) -> TDataItem:
@@ -99,17 +158,36 @@ def download_files(
     service: Any,
     storage_folder_path: Path,
     filter_by_mime_type: Sequence[str] = (),
+    credentials: Any = None,
 ) -> TDataItem:
-    for item in items:
-        if filter_by_mime_type and item["content_type"] not in filter_by_mime_type:
-            continue
-
+    def _download_file(item: TDataItem) -> TDataItem:
         file_name, file_id = item["file_name"], item["file_id"]
         result = deepcopy(item)
 
         file_path = storage_folder_path / file_name
-        download_file_from_google_drive(service, file_id, file_path.as_posix())
+        modification_time_ns = to_timestamp_ns(item["modification_date"])
+        # the local copy keeps the Drive modification time, unchanged files are not downloaded again
+        if not (
+            file_path.is_file() and file_path.stat().st_mtime_ns == modification_time_ns
+        ):
+            # stamp the modification time only on a fresh copy, never on a stale file left by a failed download
+            if download_file_from_google_drive(
+                service, file_id, file_path.as_posix(), credentials=credentials
+            ):
+                os.utime(file_path, ns=(modification_time_ns, modification_time_ns))
         if file_path.is_file():
             result["file_path"] = file_path.absolute().as_posix()
 
-        yield result
+        return result
+
+    # download files in parallel by decorating the download with defer. the connection of
+    # the shared service is not thread safe, so without credentials files are downloaded one by one
+    download = dlt.defer(_download_file) if credentials is not None else _download_file
+
+    # build the lookup set once instead of scanning the sequence for every file
+    mime_types = frozenset(filter_by_mime_type)
+    for item in items:
+        if mime_types and item["content_type"] not in mime_types:
+            continue
+
+        yield download(item)
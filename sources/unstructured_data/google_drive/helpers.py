@@ -1,26 +1,52 @@
-import io
-from typing import Any
+import os
+import uuid
+from typing import Any, Optional
 
+from dlt.common.time import ensure_pendulum_datetime
+from google_auth_httplib2 import AuthorizedHttp  # type: ignore
 from googleapiclient.errors import HttpError  # type: ignore
-from googleapiclient.http import MediaIoBaseDownload  # type: ignore
+from googleapiclient.http import MediaIoBaseDownload, build_http  # type: ignore
 
 
-def download_file_from_google_drive(service: Any, file_id: str, file_path: str) -> None:
+def build_authorized_http(credentials: Any) -> Any:
+    # httplib2 connections are not thread safe, every thread needs its own one
+    return AuthorizedHttp(credentials, http=build_http())
+
+
+def download_file_from_google_drive(
+    service: Any, file_id: str, file_path: str, credentials: Optional[Any] = None
+) -> bool:
+    # Download to a unique temporary file next to the specified file path, parallel
+    # downloads of files with the same name must not write to the same file
+    part_path = f"{file_path}.{uuid.uuid4().hex}.part"
     try:
         # Create a request to download the file
         request = service.files().get_media(fileId=file_id)
-        # Create a BytesIO object to store the file content
-        fh = io.BytesIO()
-        # Create a downloader object to handle the download
-        downloader = MediaIoBaseDownload(fh, request)
-        # Flag to track if the download is complete
-        done = False
-        # Download the next chunk of data and check if the download is complete
-        while not done:
-            _, done = downloader.next_chunk()
-        # Write the downloaded file content to the specified file path
-        with open(file_path, "wb") as f:
-            f.write(fh.getvalue())
+        if credentials is not None:
+            # give every download its own connection so they can run in parallel
+            request.http = build_authorized_http(credentials)
+        # Stream the chunks to the temporary file, the content is never held in memory as a whole
+        with open(part_path, "xb") as fh:
+            # Create a downloader object to handle the download
+            downloader = MediaIoBaseDownload(fh, request)
+            # Flag to track if the download is complete
+            done = False
+            # Download the next chunk of data and check if the download is complete
+            while not done:
+                _, done = downloader.next_chunk()
+        # Move the complete file to the specified file path
+        os.replace(part_path, file_path)
+        return True
 
     except HttpError as error:
         print(f"An error occurred: {error}")
+        return False
+    finally:
+        # Do not leave the partially downloaded file behind
+        if os.path.isfile(part_path):
+            os.remove(part_path)
+
+
+def to_timestamp_ns(date: str) -> int:
+    date_ = ensure_pendulum_datetime(date)
+    return int(date_.int_timestamp * 1_000_000_000 + date_.microsecond * 1000)
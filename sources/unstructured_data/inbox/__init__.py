@@ -1,4 +1,5 @@
 """This source collects inbox emails and downloads attachments to local folder"""
+import hashlib
 import imaplib
 import os
 from copy import deepcopy
@@ -19,6 +20,9 @@ from .settings import (
 
 @dlt.source
 def inbox_source(
+    host: str = dlt.secrets.value,
+    email_account: str = dlt.secrets.value,
+    password: str = dlt.secrets.value,
     storage_folder_path: str = STORAGE_FOLDER_PATH,
     gmail_group: Optional[str] = GMAIL_GROUP,
     attachments: bool = False,
@@ -29,6 +33,9 @@ def inbox_source(
     """This source collects inbox emails and downloads attachments to the local folder.
 
     Args:
+        host (str, optional): The hostname of the IMAP server. Default is 'dlt.secrets.value'.
+        email_account (str, optional): The email account used to log in to the IMAP server. Default is 'dlt.secrets.value'.
+        password (str, optional): The password for the email account. Default is 'dlt.secrets.value'.
         storage_folder_path (str, optional): The local folder path where attachments will be downloaded. Default is 'STORAGE_FOLDER_PATH' from settings.
         gmail_group (str, optional): The email address of the Google Group to filter emails sent to the group. Default is 'GMAIL_GROUP' from settings.
         attachments (bool, optional): If True, downloads email attachments to the 'storage_folder_path'. Default is False.
@@ -40,7 +47,11 @@ def inbox_source(
         DltResource: A dlt resource containing the collected email information.
     """
 
+    # credentials are resolved once for the source and passed explicitly to all resources
     uids = messages_uids(
+        host=host,
+        email_account=email_account,
+        password=password,
         filter_emails=filter_by_emails,
         gmail_group=gmail_group,
         folder="INBOX",
@@ -49,10 +60,15 @@ def inbox_source(
     if attachments:
         return uids | get_attachments_by_uid(
             storage_folder_path=storage_folder_path,
+            host=host,
+            email_account=email_account,
+            password=password,
             filter_by_mime_type=filter_by_mime_type,
         )
     else:
-        return uids | read_messages
+        return uids | read_messages(
+            host=host, email_account=email_account, password=password
+        )
 
 
 @dlt.resource
@@ -187,6 +203,9 @@ def get_attachments_by_uid(
         TDataItem: A dictionary containing the collected email information and attachment details.
     """
 
+    # build the lookup set once instead of scanning the sequence for every message part
+    mime_types = frozenset(filter_by_mime_type)
+
     with imaplib.IMAP4_SSL(host) as client:
         client.login(email_account, password)
         client.select()
@@ -201,14 +220,15 @@ def get_attachments_by_uid(
                 for part in msg.walk():
                     content_disposition = part.get("Content-Disposition", "")
                     content_type = part.get_content_type()
-                    if filter_by_mime_type and content_type not in filter_by_mime_type:
+                    if mime_types and content_type not in mime_types:
                         continue
 
                     if "attachment" in content_disposition:
                         filename = part.get_filename()
                         if filename:
                             attachment_data = part.get_payload(decode=True)
-                            data_hash = hash(attachment_data)
+                            # hash() of bytes is salted per process, use a digest that is stable across runs
+                            data_hash = hashlib.sha256(attachment_data).hexdigest()
 
                             attachment_path = os.path.join(
                                 storage_folder_path, message_uid + filename
@@ -226,7 +246,7 @@ def get_attachments_by_uid(
                                     "file_path": os.path.abspath(attachment_path),
                                     "content_type": content_type,
                                     "modification_date": internal_date,
-                                    "data_hash": str(data_hash),
+                                    "data_hash": data_hash,
                                 }
                             )
                             yield result
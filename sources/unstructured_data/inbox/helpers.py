@@ -1,15 +1,16 @@
 import email
 import imaplib
 from email.message import Message
+from email.utils import parsedate_to_datetime
 from time import mktime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, cast
 
 from dlt.common import pendulum
 
 
 def extract_email_info(msg: Message, include_body: bool = False) -> Dict[str, Any]:
     email_data = dict(msg)
-    email_data["Date"] = pendulum.parse(msg["Date"], strict=False)
+    email_data["Date"] = parse_email_date(msg["Date"])
     email_data["content_type"] = msg.get_content_type()
     if include_body:
         email_data["body"] = get_email_body(msg)
@@ -19,9 +20,17 @@ def extract_email_info(msg: Message, include_body: bool = False) -> Dict[str, An
     }
 
 
-def get_message_obj(client: imaplib.IMAP4_SSL, message_uid: str) -> Optional[Message]:
-    client.select()
+def parse_email_date(date: str) -> pendulum.DateTime:
+    # the RFC 2822 parser from stdlib is much cheaper than the generic pendulum parser,
+    # it also applies the obsolete named zones (EST, PST...) that pendulum ignores
+    try:
+        return pendulum.instance(parsedate_to_datetime(date))
+    except (TypeError, ValueError):
+        return cast(pendulum.DateTime, pendulum.parse(date, strict=False))
+
 
+def get_message_obj(client: imaplib.IMAP4_SSL, message_uid: str) -> Optional[Message]:
+    # the mailbox is selected once by the caller, do not re-select it on every fetch
     status, data = client.uid("fetch", message_uid, "(RFC822)")
     msg = None
     if status == "OK":
@@ -34,7 +43,6 @@ def get_message_obj(client: imaplib.IMAP4_SSL, message_uid: str) -> Optional[Mes
 
 
 def get_internal_date(client: imaplib.IMAP4_SSL, message_uid: str) -> Optional[Any]:
-    client.select()
     status, data = client.uid("fetch", message_uid, "(INTERNALDATE)")
     date = None
     if status == "OK":
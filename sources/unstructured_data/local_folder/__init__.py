@@ -1,7 +1,9 @@
 """Those resources collect filepaths from local folder to destinations"""
 import mimetypes
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Sequence, Union
+from typing import Iterator, Optional, Sequence, Union
 
 import dlt
 from dlt.extract.source import TDataItem
@@ -28,18 +30,49 @@ def local_folder_resource(
 
 
 def get_files(data_dir: str) -> TDataItem:
-    if not Path(data_dir).is_dir():
-        if not Path(data_dir).exists():
+    data_path = Path(data_dir)
+    if not data_path.is_dir():
+        if not data_path.exists():
             raise ValueError(f"Local folder doesn't exist: {data_dir}")
         else:
             raise ValueError(f"Local folder is not a directory: {data_dir}")
 
-    files = (p.resolve() for p in Path(data_dir).glob("**/*"))
+    # scandir joins paths with os.sep, keep them in posix form like Path.as_posix()
+    to_posix = os.sep != "/"
+    # resolve the folder once, the paths found below it are already absolute
+    for entry in scan_files(data_path.resolve().as_posix()):
+        yield {
+            "file_path": entry.path.replace(os.sep, "/") if to_posix else entry.path,
+            "file_name": entry.name,
+            "content_type": guess_content_type(entry.name),
+        }
 
-    for file in files:
-        if file.is_file():
-            yield {
-                "file_path": file.as_posix(),
-                "file_name": file.name,
-                "content_type": mimetypes.guess_type(file.name)[0],
-            }
+
+def scan_files(folder: str) -> Iterator["os.DirEntry[str]"]:
+    # scandir returns the entry type with the listing, so no stat call is needed per file
+    try:
+        entries = os.scandir(folder)
+    except PermissionError:
+        # like glob("**/*"), skip folders that cannot be read
+        return
+    with entries:
+        for entry in entries:
+            # like glob("**/*"), do not descend into symlinked folders
+            if entry.is_dir(follow_symlinks=False):
+                yield from scan_files(entry.path)
+            elif entry.is_file():
+                yield entry
+
+
+def guess_content_type(file_name: str) -> Optional[str]:
+    root, extension = os.path.splitext(file_name)
+    # compression encodings like ".tar.gz" need the preceding extension to guess the type
+    if extension in mimetypes.encodings_map:
+        extension = os.path.splitext(root)[1] + extension
+    return _guess_content_type_by_extension(extension)
+
+
+@lru_cache(maxsize=1024)
+def _guess_content_type_by_extension(extension: str) -> Optional[str]:
+    # the guess depends only on the file extension, so it is computed once per extension
+    return mimetypes.guess_type("file" + extension)[0]
@@ -1,13 +1,33 @@
-from typing import Sequence
+import mimetypes
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Sequence
 
 import dlt
+import httplib2  # type: ignore
 import pytest
+from dlt.common import pendulum
 from dlt.extract.source import DltResource
+from googleapiclient.errors import HttpError  # type: ignore
 
-from sources.unstructured_data import unstructured_to_structured_resource
-from sources.unstructured_data.google_drive import google_drive_source
+from sources.unstructured_data import google_drive, unstructured_to_structured_resource
+from sources.unstructured_data.google_drive import (
+    download_files,
+    get_files_uris,
+    google_drive_source,
+)
+from sources.unstructured_data.google_drive.helpers import (
+    download_file_from_google_drive,
+    to_timestamp_ns,
+)
 from sources.unstructured_data.inbox import inbox_source
-from sources.unstructured_data.local_folder import local_folder_resource
+from sources.unstructured_data.inbox.helpers import parse_email_date
+from sources.unstructured_data.local_folder import (
+    get_files,
+    guess_content_type,
+    local_folder_resource,
+)
 
 from tests.utils import ALL_DESTINATIONS, assert_load_info, skipifwindows
 
@@ -33,6 +53,224 @@ def run_pipeline(
     return pipeline, load_info
 
 
+def test_local_folder_yields_files(data_dir: str) -> None:
+    # files are streamed one by one, the transformer expects a single file per item.
+    # iterating the resource flattens lists, so check the generator it yields from
+    files = get_files(data_dir)
+    assert isinstance(files, Iterator)
+    first = next(files)
+    assert isinstance(first, dict)
+    assert set(first) == {"file_path", "file_name", "content_type"}
+
+    items = [first, *files]
+    assert all(isinstance(item, dict) for item in items)
+    # paths are reported in posix form on every platform
+    assert all(
+        item["file_path"] == Path(item["file_path"]).as_posix() for item in items
+    )
+    assert sorted(item["file_name"] for item in items) == [
+        "invoice_1.pdf",
+        "invoice_2.txt",
+        "invoice_3.jpg",
+    ]
+
+
+@pytest.mark.parametrize(
+    "file_name",
+    ("a.pdf", "A.PDF", "a.tar.gz", "report.pdf.Z", "report.2023.05.10.pdf", "a", ".a"),
+)
+def test_guess_content_type(file_name: str) -> None:
+    assert guess_content_type(file_name) == mimetypes.guess_type(file_name)[0]
+
+
+def test_local_folder_skips_unreadable_folders(tmp_path, monkeypatch) -> None:
+    (tmp_path / "locked").mkdir()
+    (tmp_path / "locked" / "b.pdf").touch()
+    (tmp_path / "a.pdf").touch()
+    scandir = os.scandir
+
+    def locked_scandir(path: str) -> Any:
+        if path.endswith("locked"):
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", locked_scandir)
+    items = list(local_folder_resource(data_dir=tmp_path.as_posix()))
+    assert [item["file_name"] for item in items] == ["a.pdf"]
+
+
+@pytest.mark.parametrize(
+    "date,expected",
+    (
+        ("Tue, 11 Jul 2023 10:20:30 +0200", "2023-07-11T10:20:30+02:00"),
+        # unknown zone is loaded as UTC
+        ("Tue, 11 Jul 2023 10:20:30 -0000", "2023-07-11T10:20:30+00:00"),
+        ("Wed, 10 May 2023 12:34:56 PST", "2023-05-10T12:34:56-08:00"),
+        # not an RFC 2822 date, parsed by pendulum
+        ("2023-07-11 10:20:30", "2023-07-11T10:20:30+00:00"),
+    ),
+)
+def test_parse_email_date(date: str, expected: str) -> None:
+    parsed = parse_email_date(date)
+    assert isinstance(parsed, pendulum.DateTime)
+    assert parsed.isoformat() == expected
+
+
+def test_to_timestamp_ns() -> None:
+    assert to_timestamp_ns("2023-07-11T10:20:30.123Z") == 1689070830123000000
+    assert to_timestamp_ns("2023-07-11T12:20:30+02:00") == 1689070830000000000
+
+
+class FakeDriveService:
+    """Lists two pages with a single file each and records every list request."""
+
+    def __init__(self) -> None:
+        self.requests: List[Any] = []
+        self.second_page_listed = threading.Event()
+
+    def files(self) -> Any:
+        return self
+
+    def list(self, q: str, fields: str, pageToken: Optional[str] = None) -> Any:
+        service = self
+
+        class _ListRequest:
+            def execute(self, http: Any = None) -> Any:
+                service.requests.append(
+                    (q, pageToken, http, threading.current_thread())
+                )
+                if pageToken is None:
+                    return {"files": [drive_file("1")], "nextPageToken": "t1"}
+                service.second_page_listed.set()
+                return {"files": [drive_file("2")]}
+
+        return _ListRequest()
+
+
+def drive_file(file_id: str) -> Any:
+    return {
+        "id": file_id,
+        "name": f"invoice_{file_id}.pdf",
+        "mimeType": "application/pdf",
+        "parents": ["folder"],
+        "modifiedTime": "2023-07-01T00:00:00.000Z",
+        "createdTime": "2023-07-01T00:00:00.000Z",
+    }
+
+
+def test_google_drive_lists_all_pages() -> None:
+    service = FakeDriveService()
+    pages = iter(
+        get_files_uris(
+            service, ["folder"], filter_by_mime_type=("application/pdf", "text/plain")
+        )
+    )
+    assert next(pages)["file_id"] == "1"
+    # without credentials the shared connection is used, the next page is listed only when needed
+    assert not service.second_page_listed.is_set()
+    assert [item["file_id"] for item in pages] == ["2"]
+
+    assert [request[1] for request in service.requests] == [None, "t1"]
+    for q, _, http, thread in service.requests:
+        # mime types are filtered on the server
+        assert (
+            q
+            == "'folder' in parents and (mimeType = 'application/pdf' or mimeType = 'text/plain')"
+        )
+        assert http is None
+        assert thread is threading.current_thread()
+
+
+def test_google_drive_prefetches_next_page(monkeypatch) -> None:
+    monkeypatch.setattr(
+        google_drive, "build_authorized_http", lambda credentials: ("http", credentials)
+    )
+    service = FakeDriveService()
+    pages = iter(get_files_uris(service, ["folder"], credentials="credentials"))
+    assert next(pages)["file_id"] == "1"
+    # the next page is listed while the first one is still being processed
+    assert service.second_page_listed.wait(5)
+    assert [item["file_id"] for item in pages] == ["2"]
+
+    assert [request[1] for request in service.requests] == [None, "t1"]
+    for q, _, http, thread in service.requests:
+        assert q == "'folder' in parents"
+        # listing runs on its own connection in the worker thread
+        assert http == ("http", "credentials")
+        assert thread is not threading.current_thread()
+
+
+def test_google_drive_failed_download_keeps_file(tmp_path, monkeypatch) -> None:
+    class FailingDownloader:
+        def __init__(self, fh: Any, request: Any) -> None:
+            pass
+
+        def next_chunk(self) -> Any:
+            raise HttpError(httplib2.Response({"status": 500}), b"")
+
+    class Service:
+        def files(self) -> Any:
+            return self
+
+        def get_media(self, fileId: str) -> Any:
+            return object()
+
+    file_path = tmp_path / "report.pdf"
+    file_path.write_text("content-v1")
+    monkeypatch.setattr(google_drive.helpers, "MediaIoBaseDownload", FailingDownloader)
+
+    assert not download_file_from_google_drive(Service(), "id", file_path.as_posix())
+    # the old copy is untouched and no temporary file is left behind
+    assert file_path.read_text() == "content-v1"
+    assert os.listdir(tmp_path) == ["report.pdf"]
+
+
+def test_google_drive_skips_unchanged_files(tmp_path, monkeypatch) -> None:
+    downloads: List[str] = []
+    fail_download = False
+
+    def fake_download(
+        service: Any, file_id: str, file_path: str, credentials: Optional[Any] = None
+    ) -> bool:
+        downloads.append(file_id)
+        if fail_download:
+            return False
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(f"content-{file_id}")
+        return True
+
+    monkeypatch.setattr(google_drive, "download_file_from_google_drive", fake_download)
+
+    def run(file_id: str, modification_date: str) -> List[Any]:
+        item = {
+            "file_id": file_id,
+            "file_name": "report.pdf",
+            "content_type": "application/pdf",
+            "modification_date": modification_date,
+        }
+        return list(
+            dlt.resource([[item]], name="files_ids") | download_files(None, tmp_path)
+        )
+
+    file_path = tmp_path / "report.pdf"
+    run("v1", "2023-07-01T00:00:00.000Z")
+    assert downloads == ["v1"]
+    # unchanged file is not downloaded again
+    result = run("v1", "2023-07-01T00:00:00.000Z")
+    assert downloads == ["v1"]
+    assert result[0]["file_path"] == file_path.absolute().as_posix()
+
+    # failed download must not mark the old copy as up to date
+    fail_download = True
+    run("v2", "2023-07-02T00:00:00.000Z")
+    assert file_path.read_text() == "content-v1"
+    fail_download = False
+    run("v2", "2023-07-02T00:00:00.000Z")
+    assert downloads == ["v1", "v2", "v2"]
+    assert file_path.read_text() == "content-v2"
+    assert file_path.stat().st_mtime_ns == to_timestamp_ns("2023-07-02T00:00:00.000Z")
+
+
 @skipifwindows
 @pytest.mark.parametrize("destination_name", ALL_DESTINATIONS)
 class TestUnstructuredFromLocalFolder: